@@ -0,0 +1,22 @@
+-- One-time indexes for the Supabase database backing the photo frame.
+-- Run these once against the database; no code changes are required.
+
+-- The frame looks images up by month-day. Without a matching expression
+-- index that is a sequential scan of the whole assets table on every
+-- display cycle; with it, the lookup is an index scan. EXTRACT is used
+-- rather than TO_CHAR because to_char(timestamp, text) is only STABLE
+-- (locale-dependent) and Postgres refuses it in an index expression.
+CREATE INDEX IF NOT EXISTS assets_monthday_idx
+    ON assets (EXTRACT(MONTH FROM image_creation_date),
+               EXTRACT(DAY FROM image_creation_date))
+    WHERE image_proxy_name IS NOT NULL;
+
+-- Makes the recently-displayed anti-join against display_logs an
+-- index-only scan instead of a per-candidate table scan.
+CREATE INDEX IF NOT EXISTS display_logs_uuid_date_idx
+    ON display_logs (uuid, display_date DESC);
+
+-- Backs the ON CONFLICT DO NOTHING upsert in log_image_displayed, which
+-- replaces the old SELECT-then-INSERT pair with a single statement.
+CREATE UNIQUE INDEX IF NOT EXISTS display_logs_uuid_date_frame_uq
+    ON display_logs (uuid, display_date, frame_id);